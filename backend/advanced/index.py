@@ -1,10 +1,75 @@
 import json
+import gzip
 import os
 import psycopg2
 import boto3
 import base64
 import urllib.request
-from datetime import datetime
+from datetime import date, datetime
+from replicas import add_write_token, connect_for_read
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+
+def pick_encoding(headers: dict) -> str:
+    '''Выбирает алгоритм сжатия по заголовку Accept-Encoding клиента'''
+    accept = ''
+    for key, value in (headers or {}).items():
+        if key.lower() == 'accept-encoding':
+            accept = value or ''
+    
+    accepted = {}
+    for part in accept.split(','):
+        token, *params = part.split(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value.strip())
+                except ValueError:
+                    weight = 0.0
+        accepted[token] = weight
+    
+    # Наибольший q; при равенстве предпочитаем br
+    candidates = (['br'] if brotli else []) + ['gzip']
+    weights = {encoding: accepted.get(encoding, accepted.get('*', 0.0)) for encoding in candidates}
+    best = max(candidates, key=lambda encoding: (weights[encoding], encoding == 'br'))
+    return best if weights[best] > 0 else ''
+
+def compact_value(value):
+    '''Значение для колоночного формата: даты — ISO; метки времени переводятся в миллисекунды эпохи в SQL'''
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def to_compact(columns: list, rows: list) -> dict:
+    '''Колоночный формат списка: имена полей один раз, строки из БД массивами'''
+    return {'columns': columns, 'rows': [[compact_value(value) for value in row] for row in rows]}
+
+def json_response(event: dict, payload: dict) -> dict:
+    '''JSON-ответ со сжатием gzip/brotli для тел крупнее COMPRESS_MIN_BYTES'''
+    headers = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', 'Vary': 'Accept-Encoding'}
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    raw = body.encode('utf-8')
+    encoding = pick_encoding(event.get('headers')) if len(raw) >= COMPRESS_MIN_BYTES else ''
+    
+    if not encoding:
+        return {'statusCode': 200, 'headers': headers, 'body': body, 'isBase64Encoded': False}
+    
+    if encoding == 'br':
+        data = brotli.compress(raw, quality=5)
+    else:
+        data = gzip.compress(raw, compresslevel=6)
+    headers['Content-Encoding'] = encoding
+    return {'statusCode': 200, 'headers': headers, 'body': base64.b64encode(data).decode('ascii'), 'isBase64Encoded': True}
 
 def handler(event: dict, context) -> dict:
     '''API для расширенных функций: лекарства, погода, заметки, загрузка фото, удаление аккаунта'''
@@ -24,12 +89,15 @@ def handler(event: dict, context) -> dict:
             'isBase64Encoded': False
         }
     
-    db_url = os.environ.get('DATABASE_URL')
-    conn = psycopg2.connect(db_url)
+    params = event.get('queryStringParameters', {}) or {}
+    
+    if method == 'GET':
+        conn = connect_for_read(params)
+    else:
+        conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     cursor = conn.cursor()
     
     try:
-        params = event.get('queryStringParameters', {}) or {}
         action = params.get('action')
         
         if method == 'GET':
@@ -74,22 +142,28 @@ def handler(event: dict, context) -> dict:
                 user_id = params.get('userId')
                 cursor.execute('SELECT id, name, dosage, frequency, time_schedule, notes FROM medications WHERE user_id = %s ORDER BY name', (user_id,))
                 medications = cursor.fetchall()
+                if params.get('format') == 'compact':
+                    return json_response(event, {'success': True, 'medications': to_compact(['id', 'name', 'dosage', 'frequency', 'timeSchedule', 'notes'], medications)})
                 meds_list = [{'id': r[0], 'name': r[1], 'dosage': r[2], 'frequency': r[3], 'timeSchedule': r[4], 'notes': r[5]} for r in medications]
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'medications': meds_list}), 'isBase64Encoded': False}
+                return json_response(event, {'success': True, 'medications': meds_list})
             
             elif action == 'notes':
                 user_id = params.get('userId')
-                cursor.execute('SELECT id, title, content, created_at FROM notes WHERE user_id = %s ORDER BY updated_at DESC', (user_id,))
+                cursor.execute('''SELECT id, title, content, created_at, (EXTRACT(EPOCH FROM created_at AT TIME ZONE current_setting('TimeZone')) * 1000)::bigint FROM notes WHERE user_id = %s ORDER BY updated_at DESC''', (user_id,))
                 notes = cursor.fetchall()
+                if params.get('format') == 'compact':
+                    return json_response(event, {'success': True, 'notes': to_compact(['id', 'title', 'content', 'createdAt'], [r[:3] + (r[4],) for r in notes])})
                 notes_list = [{'id': r[0], 'title': r[1], 'content': r[2], 'createdAt': r[3].isoformat() if r[3] else None} for r in notes]
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'notes': notes_list}), 'isBase64Encoded': False}
+                return json_response(event, {'success': True, 'notes': notes_list})
             
             elif action == 'photos':
                 user_id = params.get('userId')
-                cursor.execute('SELECT id, photo_url, description, uploaded_at FROM gallery_photos WHERE user_id = %s ORDER BY uploaded_at DESC', (user_id,))
+                cursor.execute('''SELECT id, photo_url, description, uploaded_at, (EXTRACT(EPOCH FROM uploaded_at AT TIME ZONE current_setting('TimeZone')) * 1000)::bigint FROM gallery_photos WHERE user_id = %s ORDER BY uploaded_at DESC''', (user_id,))
                 photos = cursor.fetchall()
+                if params.get('format') == 'compact':
+                    return json_response(event, {'success': True, 'photos': to_compact(['id', 'photoUrl', 'description', 'uploadedAt'], [r[:3] + (r[4],) for r in photos])})
                 photos_list = [{'id': r[0], 'photoUrl': r[1], 'description': r[2], 'uploadedAt': r[3].isoformat() if r[3] else None} for r in photos]
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'photos': photos_list}), 'isBase64Encoded': False}
+                return json_response(event, {'success': True, 'photos': photos_list})
         
         elif method == 'POST':
             body = json.loads(event.get('body', '{}'))
@@ -103,21 +177,21 @@ def handler(event: dict, context) -> dict:
                 )
                 med = cursor.fetchone()
                 conn.commit()
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'medication': {'id': med[0], 'name': med[1]}}), 'isBase64Encoded': False}
+                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps(add_write_token({'success': True, 'medication': {'id': med[0], 'name': med[1]}}, cursor)), 'isBase64Encoded': False}
             
             elif action == 'logMedication':
                 cursor.execute('INSERT INTO medication_logs (medication_id, user_id, skipped) VALUES (%s, %s, %s) RETURNING id',
                     (body.get('medicationId'), body.get('userId'), body.get('skipped', False)))
                 log_id = cursor.fetchone()[0]
                 conn.commit()
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'logId': log_id}), 'isBase64Encoded': False}
+                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps(add_write_token({'success': True, 'logId': log_id}, cursor)), 'isBase64Encoded': False}
             
             elif action == 'addNote':
                 user_id = body.get('userId')
                 cursor.execute('INSERT INTO notes (user_id, title, content) VALUES (%s, %s, %s) RETURNING id, title', (user_id, body.get('title'), body.get('content')))
                 note = cursor.fetchone()
                 conn.commit()
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'note': {'id': note[0], 'title': note[1]}}), 'isBase64Encoded': False}
+                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps(add_write_token({'success': True, 'note': {'id': note[0], 'title': note[1]}}, cursor)), 'isBase64Encoded': False}
             
             elif action == 'uploadPhoto':
                 user_id = body.get('userId')
@@ -139,7 +213,7 @@ def handler(event: dict, context) -> dict:
                 photo_id = cursor.fetchone()[0]
                 conn.commit()
                 
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True, 'photo': {'id': photo_id, 'photoUrl': cdn_url}}), 'isBase64Encoded': False}
+                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps(add_write_token({'success': True, 'photo': {'id': photo_id, 'photoUrl': cdn_url}}, cursor)), 'isBase64Encoded': False}
             
             elif action == 'updateProfile':
                 user_id = body.get('userId')
@@ -182,13 +256,13 @@ def handler(event: dict, context) -> dict:
                 cursor.execute(f"UPDATE users SET {', '.join(updates)}, updated_at = CURRENT_TIMESTAMP WHERE id = %s RETURNING id", tuple(values))
                 conn.commit()
                 
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True}), 'isBase64Encoded': False}
+                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps(add_write_token({'success': True}, cursor)), 'isBase64Encoded': False}
             
             elif action == 'deleteAccount':
                 user_id = body.get('userId')
                 cursor.execute('UPDATE users SET phone = %s WHERE id = %s', (f'deleted_{user_id}', user_id))
                 conn.commit()
-                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'success': True}), 'isBase64Encoded': False}
+                return {'statusCode': 200, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps(add_write_token({'success': True}, cursor)), 'isBase64Encoded': False}
         
         return {'statusCode': 405, 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}, 'body': json.dumps({'error': 'Method not allowed'}), 'isBase64Encoded': False}
         
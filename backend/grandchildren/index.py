@@ -1,6 +1,73 @@
 import json
+import gzip
+import base64
 import os
 import psycopg2
+from datetime import date
+from replicas import add_write_token, connect_for_read
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+
+def pick_encoding(headers: dict) -> str:
+    '''Выбирает алгоритм сжатия по заголовку Accept-Encoding клиента'''
+    accept = ''
+    for key, value in (headers or {}).items():
+        if key.lower() == 'accept-encoding':
+            accept = value or ''
+    
+    accepted = {}
+    for part in accept.split(','):
+        token, *params = part.split(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value.strip())
+                except ValueError:
+                    weight = 0.0
+        accepted[token] = weight
+    
+    # Наибольший q; при равенстве предпочитаем br
+    candidates = (['br'] if brotli else []) + ['gzip']
+    weights = {encoding: accepted.get(encoding, accepted.get('*', 0.0)) for encoding in candidates}
+    best = max(candidates, key=lambda encoding: (weights[encoding], encoding == 'br'))
+    return best if weights[best] > 0 else ''
+
+def compact_value(value):
+    '''Значение для колоночного формата: даты — ISO; метки времени переводятся в миллисекунды эпохи в SQL'''
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def to_compact(columns: list, rows: list) -> dict:
+    '''Колоночный формат списка: имена полей один раз, строки из БД массивами'''
+    return {'columns': columns, 'rows': [[compact_value(value) for value in row] for row in rows]}
+
+def json_response(event: dict, payload: dict) -> dict:
+    '''JSON-ответ со сжатием gzip/brotli для тел крупнее COMPRESS_MIN_BYTES'''
+    headers = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', 'Vary': 'Accept-Encoding'}
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    raw = body.encode('utf-8')
+    encoding = pick_encoding(event.get('headers')) if len(raw) >= COMPRESS_MIN_BYTES else ''
+    
+    if not encoding:
+        return {'statusCode': 200, 'headers': headers, 'body': body, 'isBase64Encoded': False}
+    
+    if encoding == 'br':
+        data = brotli.compress(raw, quality=5)
+    else:
+        data = gzip.compress(raw, compresslevel=6)
+    headers['Content-Encoding'] = encoding
+    return {'statusCode': 200, 'headers': headers, 'body': base64.b64encode(data).decode('ascii'), 'isBase64Encoded': True}
 
 def handler(event: dict, context) -> dict:
     '''API для управления списком внуков пользователя'''
@@ -19,13 +86,16 @@ def handler(event: dict, context) -> dict:
             'isBase64Encoded': False
         }
     
-    db_url = os.environ.get('DATABASE_URL')
-    conn = psycopg2.connect(db_url)
+    params = event.get('queryStringParameters', {}) or {}
+    
+    if method == 'GET':
+        conn = connect_for_read(params)
+    else:
+        conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     cursor = conn.cursor()
     
     try:
         if method == 'GET':
-            params = event.get('queryStringParameters', {}) or {}
             user_id = params.get('userId')
             
             cursor.execute(
@@ -35,6 +105,9 @@ def handler(event: dict, context) -> dict:
             )
             
             children = cursor.fetchall()
+            if params.get('format') == 'compact':
+                return json_response(event, {'success': True, 'grandchildren': to_compact(['id', 'firstName', 'lastName', 'middleName', 'birthDate', 'gender', 'info'], children)})
+            
             children_list = [
                 {
                     'id': row[0],
@@ -48,15 +121,7 @@ def handler(event: dict, context) -> dict:
                 for row in children
             ]
             
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'success': True, 'grandchildren': children_list}),
-                'isBase64Encoded': False
-            }
+            return json_response(event, {'success': True, 'grandchildren': children_list})
             
         elif method == 'POST':
             body = json.loads(event.get('body', '{}'))
@@ -94,7 +159,7 @@ def handler(event: dict, context) -> dict:
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps({'success': True, 'grandchild': child_data}),
+                'body': json.dumps(add_write_token({'success': True, 'grandchild': child_data}, cursor)),
                 'isBase64Encoded': False
             }
         
@@ -0,0 +1,104 @@
+import os
+import random
+import time
+import psycopg2
+
+# Результаты проверки реплик живут между тёплыми вызовами функции
+_replica_probes = {}
+
+def env_float(name: str, default: float) -> float:
+    '''Число из переменной окружения; при некорректном значении — значение по умолчанию'''
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def replica_urls() -> list:
+    '''DSN реплик из DATABASE_REPLICA_URLS через запятую'''
+    return [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+
+def lsn_value(lsn: str) -> int:
+    '''Переводит LSN вида 16/B374D848 в число для сравнения'''
+    high, _, low = lsn.partition('/')
+    return (int(high, 16) << 32) + int(low, 16)
+
+def add_write_token(payload: dict, cursor) -> dict:
+    '''Добавляет к ответу на запись writeToken — позицию вставки WAL на primary после коммита.
+    Без реплик токен не нужен; ошибка его чтения не должна превращать успешную запись в 500'''
+    if not replica_urls():
+        return payload
+    try:
+        cursor.execute('SELECT pg_current_wal_insert_lsn()::text')
+        return {**payload, 'writeToken': cursor.fetchone()[0]}
+    except psycopg2.Error:
+        return payload
+
+def probe_replica(conn) -> dict:
+    '''Отставание реплики и её позиция воспроизведения WAL; без потоковой репликации отставание считается по времени'''
+    cursor = conn.cursor()
+    cursor.execute(
+        '''SELECT
+               CASE
+                   WHEN NOT pg_is_in_recovery() THEN 0
+                   WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+                        AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+                   ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+               END,
+               CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_insert_lsn() END::text'''
+    )
+    lag, replay_lsn = cursor.fetchone()
+    cursor.close()
+    conn.rollback()
+    return {
+        'checked_at': time.time(),
+        'failed': False,
+        'lag': float(lag) if lag is not None else float('inf'),
+        'replay_lsn': lsn_value(replay_lsn) if replay_lsn else 0
+    }
+
+def connect_for_read(params: dict):
+    '''Подключение для чтения: реплика, догнавшая writeToken клиента и не отстающая дольше порога, либо primary'''
+    db_url = os.environ.get('DATABASE_URL')
+    urls = replica_urls()
+    
+    if not urls:
+        return psycopg2.connect(db_url)
+    
+    max_lag = env_float('REPLICA_MAX_LAG_SECONDS', 5.0)
+    probe_ttl = env_float('REPLICA_PROBE_TTL_SECONDS', 5.0)
+    retry_after = env_float('REPLICA_RETRY_SECONDS', 30.0)
+    
+    try:
+        token = lsn_value(params['writeToken']) if params.get('writeToken') else 0
+    except ValueError:
+        token = 0
+    
+    random.shuffle(urls)
+    for replica_url in urls:
+        probe = _replica_probes.get(replica_url)
+        age = time.time() - probe['checked_at'] if probe else None
+        
+        if probe and probe['failed'] and age < retry_after:
+            continue
+        # Свежий результат проверки: отсеиваем отстающую реплику без подключения
+        cached = probe is not None and not probe['failed'] and age < probe_ttl
+        if cached and probe['lag'] + age > max_lag:
+            continue
+        
+        conn = None
+        try:
+            conn = psycopg2.connect(replica_url, connect_timeout=2)
+            if not cached or probe['replay_lsn'] < token:
+                probe = probe_replica(conn)
+                _replica_probes[replica_url] = probe
+        except psycopg2.Error:
+            _replica_probes[replica_url] = {'checked_at': time.time(), 'failed': True}
+            if conn is not None:
+                conn.close()
+            continue
+        
+        if probe['lag'] <= max_lag and probe['replay_lsn'] >= token:
+            return conn
+        conn.close()
+    
+    return psycopg2.connect(db_url)
@@ -2,6 +2,7 @@ import json
 import os
 import psycopg2
 from datetime import datetime
+from replicas import add_write_token, connect_for_read
 
 def handler(event: dict, context) -> dict:
     '''API для управления профилем пользователя: медкарта, настроение, данные'''
@@ -20,8 +21,12 @@ def handler(event: dict, context) -> dict:
             'isBase64Encoded': False
         }
     
-    db_url = os.environ.get('DATABASE_URL')
-    conn = psycopg2.connect(db_url)
+    params = event.get('queryStringParameters', {}) or {}
+    
+    if method == 'GET':
+        conn = connect_for_read(params)
+    else:
+        conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     cursor = conn.cursor()
     
     try:
@@ -48,7 +53,7 @@ def handler(event: dict, context) -> dict:
                         'Content-Type': 'application/json',
                         'Access-Control-Allow-Origin': '*'
                     },
-                    'body': json.dumps({'success': True, 'medicalCardNumber': result[0]}),
+                    'body': json.dumps(add_write_token({'success': True, 'medicalCardNumber': result[0]}, cursor)),
                     'isBase64Encoded': False
                 }
                 
@@ -69,12 +74,11 @@ def handler(event: dict, context) -> dict:
                         'Content-Type': 'application/json',
                         'Access-Control-Allow-Origin': '*'
                     },
-                    'body': json.dumps({'success': True, 'moodId': result[0]}),
+                    'body': json.dumps(add_write_token({'success': True, 'moodId': result[0]}, cursor)),
                     'isBase64Encoded': False
                 }
         
         elif method == 'GET':
-            params = event.get('queryStringParameters', {}) or {}
             user_id = params.get('userId')
             action = params.get('action')
             
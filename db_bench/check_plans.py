@@ -0,0 +1,123 @@
+import argparse
+import ast
+import json
+import os
+import re
+import sys
+from datetime import date
+from pathlib import Path
+
+import psycopg2
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+
+# Значения для плейсхолдеров по имени колонки; user_id = 1 — самый тяжёлый пользователь из seed.py
+SAMPLE_VALUES = {
+    'id': 1,
+    'user_id': 1,
+    'medication_id': 1,
+    'phone': '+79000000001',
+    'birth_date': date(1950, 5, 17),
+    'gender': 'female',
+    'mood': 'good',
+    'skipped': False,
+    'photo_url': 'https://cdn.poehali.dev/bench/gallery/1/new.jpg',
+}
+
+def extract_queries() -> list:
+    '''Собирает строковые литералы из cursor.execute внутри handler каждой функции backend'''
+    queries = []
+    for path in sorted(BACKEND_DIR.glob('*/index.py')):
+        tree = ast.parse(path.read_text(encoding='utf-8'))
+        # Служебные запросы вспомогательных функций (проверка реплик, writeToken) не проверяем
+        handler = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == 'handler')
+        for node in ast.walk(handler):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'execute' and node.args):
+                continue
+            sql = node.args[0]
+            if isinstance(sql, ast.Constant) and isinstance(sql.value, str):
+                queries.append((f'{path.parent.name}:{node.lineno}', ' '.join(sql.value.split())))
+            else:
+                print(f'SKIP {path.parent.name}:{node.lineno}: запрос собирается динамически')
+    return queries
+
+def bind_params(sql: str) -> tuple:
+    '''Подбирает параметры: по списку колонок INSERT или по шаблонам «колонка = %s»'''
+    insert = re.match(r'INSERT INTO \w+ \(([^)]*)\) VALUES', sql, re.IGNORECASE)
+    if insert:
+        columns = [col.strip() for col in insert.group(1).split(',')]
+    else:
+        columns = re.findall(r'(\w+)\s*=\s*%s', sql)
+
+    if len(columns) != sql.count('%s'):
+        raise ValueError(f'не удалось сопоставить плейсхолдеры с колонками: {sql}')
+    return tuple(SAMPLE_VALUES.get(col, f'bench {col}') for col in columns)
+
+def walk(plan: dict):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from walk(child)
+
+def plan_violations(plan: dict, seq_scan_budget: int, sort_budget: int) -> list:
+    '''Ищет Seq Scan и Sort, которые перебирают больше строк, чем разрешено бюджетом'''
+    violations = []
+    for node in walk(plan):
+        if node['Node Type'] == 'Seq Scan':
+            scanned = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * node.get('Actual Loops', 1)
+            if scanned > seq_scan_budget:
+                violations.append(f"Seq Scan по {node.get('Relation Name')}: {scanned} строк > {seq_scan_budget}")
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            sorted_rows = max(child.get('Actual Rows', 0) for child in node.get('Plans', [{}]))
+            if sorted_rows > sort_budget:
+                violations.append(f"{node['Node Type']} ({', '.join(node.get('Sort Key', []))}): {sorted_rows} строк > {sort_budget}")
+            if node.get('Sort Space Type') == 'Disk':
+                violations.append(f"{node['Node Type']} ушёл на диск: {node.get('Sort Space Used')} kB")
+    return violations
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='EXPLAIN (ANALYZE, BUFFERS) для всех запросов backend с бюджетом на Seq Scan и Sort')
+    parser.add_argument('--seq-scan-budget', type=int, default=1000)
+    parser.add_argument('--sort-budget', type=int, default=1000)
+    parser.add_argument('--verbose', action='store_true', help='печатать планы целиком')
+    parser.add_argument('--dsn', default=os.environ.get('BENCH_DATABASE_URL'),
+                        help='локальная база для бенчмарка (по умолчанию BENCH_DATABASE_URL); DATABASE_URL не используется намеренно')
+    parser.add_argument('--yes-execute-writes', action='store_true',
+                        help='подтверждение: INSERT/UPDATE из handler выполнятся в базе --dsn (с откатом, но с блокировками и сдвигом последовательностей)')
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error('укажите --dsn или BENCH_DATABASE_URL')
+    if not args.yes_execute_writes:
+        parser.error('EXPLAIN ANALYZE выполняет запросы на запись; запустите с --yes-execute-writes, если --dsn — локальная база')
+
+    conn = psycopg2.connect(args.dsn)
+    cursor = conn.cursor()
+    failed = 0
+
+    for location, sql in extract_queries():
+        try:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', bind_params(sql))
+            plan = cursor.fetchone()[0][0]
+        except (ValueError, psycopg2.Error) as e:
+            print(f'FAIL {location}: {e}')
+            failed += 1
+            continue
+        finally:
+            # ANALYZE выполняет INSERT/UPDATE по-настоящему — откатываем
+            conn.rollback()
+
+        violations = plan_violations(plan['Plan'], args.seq_scan_budget, args.sort_budget)
+        status = 'FAIL' if violations else 'ok'
+        print(f"{status} {location} ({plan['Execution Time']:.2f} ms): {sql[:80]}")
+        for violation in violations:
+            print(f'    {violation}')
+        if args.verbose:
+            print(json.dumps(plan, ensure_ascii=False, indent=2))
+        failed += bool(violations)
+
+    cursor.close()
+    conn.close()
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
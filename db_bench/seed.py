@@ -0,0 +1,183 @@
+import argparse
+import csv
+import io
+import os
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import psycopg2
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'db_migrations'
+
+FIRST_NAMES = ['Иван', 'Мария', 'Пётр', 'Анна', 'Николай', 'Галина', 'Владимир', 'Людмила', 'Сергей', 'Валентина']
+LAST_NAMES = ['Иванов', 'Петрова', 'Смирнов', 'Кузнецова', 'Попов', 'Соколова', 'Лебедев', 'Козлова', 'Новиков', 'Морозова']
+MIDDLE_NAMES = ['Иванович', 'Петровна', 'Сергеевич', 'Николаевна', None]
+SPECIALTIES = ['Терапевт', 'Кардиолог', 'Невролог', 'Окулист', 'Хирург', 'Эндокринолог', 'Стоматолог']
+MEDICINES = ['Аспирин', 'Эналаприл', 'Метформин', 'Аторвастатин', 'Омепразол', 'Бисопролол', 'Валидол']
+MOODS = ['great', 'good', 'normal', 'bad', 'terrible']
+CITIES = ['Москва', 'Казань', 'Самара', 'Тверь', 'Омск']
+
+# Сколько строк получает «тяжёлый» пользователь; у остальных — доли по Парето
+HEAVY_COUNTS = {
+    'notes': 10000,
+    'mood_logs': 5000,
+    'gallery_photos': 2000,
+    'medications': 40,
+    'medication_logs': 20000,
+    'doctors': 30,
+    'grandchildren': 12,
+    'utility_payments': 240,
+}
+TYPICAL_COUNTS = {
+    'notes': 8,
+    'mood_logs': 20,
+    'gallery_photos': 5,
+    'medications': 3,
+    'medication_logs': 30,
+    'doctors': 2,
+    'grandchildren': 2,
+    'utility_payments': 6,
+}
+
+TABLE_COLUMNS = {
+    'users': ['phone', 'first_name', 'last_name', 'middle_name', 'email', 'birth_date', 'medical_card_number',
+              'created_at', 'updated_at', 'sos_pin_code', 'city', 'street', 'house', 'entrance', 'apartment', 'utility_account'],
+    'grandchildren': ['user_id', 'first_name', 'last_name', 'middle_name', 'birth_date', 'gender', 'info', 'created_at'],
+    'doctors': ['user_id', 'first_name', 'last_name', 'middle_name', 'specialty', 'phone', 'created_at'],
+    'gallery_photos': ['user_id', 'photo_url', 'description', 'uploaded_at'],
+    'mood_logs': ['user_id', 'mood', 'created_at'],
+    'medications': ['user_id', 'name', 'dosage', 'frequency', 'time_schedule', 'notes', 'created_at'],
+    'medication_logs': ['medication_id', 'user_id', 'taken_at', 'skipped'],
+    'notes': ['user_id', 'title', 'content', 'created_at', 'updated_at'],
+    'utility_payments': ['user_id', 'amount', 'payment_date', 'qr_code', 'status'],
+}
+
+def apply_migrations(conn) -> None:
+    '''Применяет миграции из db_migrations по порядку версий'''
+    cursor = conn.cursor()
+    for path in sorted(MIGRATIONS_DIR.glob('V*.sql'), key=lambda p: int(p.name[1:].split('__')[0])):
+        cursor.execute(path.read_text(encoding='utf-8'))
+    conn.commit()
+    cursor.close()
+
+def row_count(rng: random.Random, table: str, heavy: bool) -> int:
+    '''Число строк таблицы для пользователя: фиксированно для тяжёлых, по Парето для остальных'''
+    if heavy:
+        return HEAVY_COUNTS[table]
+    return min(HEAVY_COUNTS[table] // 4, int(TYPICAL_COUNTS[table] * rng.paretovariate(1.5)) - 1)
+
+def moment(rng: random.Random, now: datetime, days: int) -> datetime:
+    return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+def generate(rng: random.Random, users: int, heavy_users: int) -> dict:
+    '''Строит строки для всех таблиц; пользователи 1..heavy_users — тяжёлые'''
+    now = datetime.now().replace(microsecond=0)
+    rows = {table: [] for table in TABLE_COLUMNS}
+    medication_id = 0
+
+    for user_id in range(1, users + 1):
+        heavy = user_id <= heavy_users
+        created = moment(rng, now, 1500)
+        rows['users'].append([
+            f'+7900{user_id:07d}', rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(MIDDLE_NAMES),
+            f'user{user_id}@example.com' if rng.random() < 0.4 else None,
+            date(rng.randint(1930, 1965), rng.randint(1, 12), rng.randint(1, 28)),
+            f'MC{user_id:08d}' if rng.random() < 0.5 else None,
+            created, created, f'{rng.randint(0, 9999):04d}', rng.choice(CITIES), 'ул. Ленина',
+            str(rng.randint(1, 120)), str(rng.randint(1, 8)), str(rng.randint(1, 300)), f'LS{user_id:09d}',
+        ])
+
+        for _ in range(row_count(rng, 'grandchildren', heavy)):
+            rows['grandchildren'].append([
+                user_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(MIDDLE_NAMES),
+                date(rng.randint(1990, 2022), rng.randint(1, 12), rng.randint(1, 28)),
+                rng.choice(['male', 'female']), 'Любит рисовать' if rng.random() < 0.3 else None, moment(rng, now, 1000),
+            ])
+
+        for _ in range(row_count(rng, 'doctors', heavy)):
+            rows['doctors'].append([
+                user_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(MIDDLE_NAMES),
+                rng.choice(SPECIALTIES), f'+7495{rng.randint(0, 9999999):07d}', moment(rng, now, 1000),
+            ])
+
+        for n in range(row_count(rng, 'gallery_photos', heavy)):
+            rows['gallery_photos'].append([
+                user_id, f'https://cdn.poehali.dev/bench/gallery/{user_id}/{n}.jpg',
+                'Семейное фото' if rng.random() < 0.5 else None, moment(rng, now, 1000),
+            ])
+
+        for _ in range(row_count(rng, 'mood_logs', heavy)):
+            rows['mood_logs'].append([user_id, rng.choice(MOODS), moment(rng, now, 1000)])
+
+        user_medications = []
+        for _ in range(row_count(rng, 'medications', heavy)):
+            medication_id += 1
+            user_medications.append(medication_id)
+            rows['medications'].append([
+                user_id, rng.choice(MEDICINES), f'{rng.choice([5, 10, 50, 100, 500])} мг', '2 раза в день',
+                '09:00, 21:00', 'После еды' if rng.random() < 0.3 else None, moment(rng, now, 1000),
+            ])
+
+        if user_medications:
+            for _ in range(row_count(rng, 'medication_logs', heavy)):
+                rows['medication_logs'].append([
+                    rng.choice(user_medications), user_id, moment(rng, now, 700), rng.random() < 0.1,
+                ])
+
+        for n in range(row_count(rng, 'notes', heavy)):
+            note_created = moment(rng, now, 1000)
+            rows['notes'].append([
+                user_id, f'Заметка {n}', 'Купить хлеб, молоко и лекарства. ' * rng.randint(1, 6),
+                note_created, note_created + timedelta(seconds=rng.randint(0, 86400 * 30)),
+            ])
+
+        for _ in range(row_count(rng, 'utility_payments', heavy)):
+            rows['utility_payments'].append([
+                user_id, round(rng.uniform(500, 9000), 2), moment(rng, now, 1500), None,
+                rng.choice(['pending', 'paid', 'paid', 'paid']),
+            ])
+
+    return rows
+
+def copy_rows(cursor, table: str, rows: list) -> None:
+    '''Загружает строки через COPY: пустые поля CSV становятся NULL'''
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(TABLE_COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Заполняет локальную базу синтетическими данными с перекосом по пользователям')
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--heavy-users', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dsn', default=os.environ.get('BENCH_DATABASE_URL'),
+                        help='локальная база для бенчмарка (по умолчанию BENCH_DATABASE_URL); DATABASE_URL не используется намеренно')
+    parser.add_argument('--yes-truncate', action='store_true', help='подтверждение: все таблицы базы --dsn будут очищены')
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error('укажите --dsn или BENCH_DATABASE_URL')
+    if not args.yes_truncate:
+        parser.error('seed.py очищает все таблицы приложения; запустите с --yes-truncate, если --dsn — локальная база')
+
+    conn = psycopg2.connect(args.dsn)
+    apply_migrations(conn)
+
+    rows = generate(random.Random(args.seed), args.users, args.heavy_users)
+
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE {', '.join(TABLE_COLUMNS)} RESTART IDENTITY CASCADE")
+    for table in TABLE_COLUMNS:
+        copy_rows(cursor, table, rows[table])
+        print(f'{table}: {len(rows[table])}')
+    conn.commit()
+
+    conn.autocommit = True
+    cursor.execute('ANALYZE')
+    cursor.close()
+    conn.close()
+
+if __name__ == '__main__':
+    main()
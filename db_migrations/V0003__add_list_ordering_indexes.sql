@@ -0,0 +1,9 @@
+-- Составные индексы под сортировку списков пользователя (без Sort по всем строкам)
+CREATE INDEX IF NOT EXISTS idx_notes_user_updated ON notes(user_id, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_gallery_user_uploaded ON gallery_photos(user_id, uploaded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_mood_user_created ON mood_logs(user_id, created_at DESC);
+
+-- Одиночные индексы по user_id покрываются составными
+DROP INDEX IF EXISTS idx_notes_user_id;
+DROP INDEX IF EXISTS idx_gallery_user_id;
+DROP INDEX IF EXISTS idx_mood_user_id;
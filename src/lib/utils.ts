@@ -4,3 +4,14 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+export function rememberWriteToken(token?: string) {
+  if (token) {
+    localStorage.setItem('writeToken', token)
+  }
+}
+
+export function withWriteToken(url: string) {
+  const token = localStorage.getItem('writeToken')
+  return token ? `${url}&writeToken=${encodeURIComponent(token)}` : url
+}
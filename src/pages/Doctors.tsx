@@ -5,6 +5,7 @@ import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
+import { rememberWriteToken, withWriteToken } from '@/lib/utils';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
 
 const API_URL = 'https://functions.poehali.dev/de0d5e49-e4be-472f-ab36-f8000eb27b8e';
@@ -43,7 +44,7 @@ const Doctors = ({ user }: DoctorsProps) => {
 
   const loadDoctors = async () => {
     try {
-      const response = await fetch(`${API_URL}?userId=${user.id}`);
+      const response = await fetch(withWriteToken(`${API_URL}?userId=${user.id}`));
       const data = await response.json();
       if (data.success) {
         setDoctors(data.doctors);
@@ -80,6 +81,7 @@ const Doctors = ({ user }: DoctorsProps) => {
           specialty: '',
           phone: ''
         });
+        rememberWriteToken(data.writeToken);
         loadDoctors();
       }
     } catch (error) {
@@ -7,6 +7,7 @@ import { Textarea } from '@/components/ui/textarea';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
+import { rememberWriteToken, withWriteToken } from '@/lib/utils';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
 
 const API_URL = 'https://functions.poehali.dev/a395a6a4-78e1-4fc0-b51f-8099a0a6a83d';
@@ -47,7 +48,7 @@ const Grandchildren = ({ user }: GrandchildrenProps) => {
 
   const loadGrandchildren = async () => {
     try {
-      const response = await fetch(`${API_URL}?userId=${user.id}`);
+      const response = await fetch(withWriteToken(`${API_URL}?userId=${user.id}`));
       const data = await response.json();
       if (data.success) {
         setGrandchildren(data.grandchildren);
@@ -85,6 +86,7 @@ const Grandchildren = ({ user }: GrandchildrenProps) => {
           gender: 'male',
           info: ''
         });
+        rememberWriteToken(data.writeToken);
         loadGrandchildren();
       }
     } catch (error) {
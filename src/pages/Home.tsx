@@ -4,6 +4,7 @@ import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
+import { rememberWriteToken } from '@/lib/utils';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
 
 const API_AUTH_URL = 'https://functions.poehali.dev/a1c319aa-17e9-4504-9466-3f6378fd7d97';
@@ -67,6 +68,8 @@ const Home = ({ user, onLogout }: HomeProps) => {
       });
       
       if (response.ok) {
+        const data = await response.json();
+        rememberWriteToken(data.writeToken);
         toast.success('Настроение сохранено');
       }
     } catch (error) {
@@ -87,6 +90,8 @@ const Home = ({ user, onLogout }: HomeProps) => {
       });
       
       if (response.ok) {
+        const data = await response.json();
+        rememberWriteToken(data.writeToken);
         toast.success('Медицинская карта сохранена');
         setShowMedicalDialog(false);
         
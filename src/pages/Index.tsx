@@ -110,6 +110,7 @@ const Index = () => {
   const handleLogout = () => {
     setCurrentUser(null);
     localStorage.removeItem('currentUser');
+    localStorage.removeItem('writeToken');
     setFormData({
       phone: '',
       firstName: '',
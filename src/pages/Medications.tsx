@@ -6,6 +6,7 @@ import { Label } from '@/components/ui/label';
 import { Textarea } from '@/components/ui/textarea';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
+import { rememberWriteToken, withWriteToken } from '@/lib/utils';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
 
 const API_URL = 'https://functions.poehali.dev/72aa9561-f0df-4bf9-9d70-6906f648dca1';
@@ -44,7 +45,7 @@ const Medications = ({ user }: MedicationsProps) => {
 
   const loadMedications = async () => {
     try {
-      const response = await fetch(`${API_URL}?action=medications&userId=${user.id}`);
+      const response = await fetch(withWriteToken(`${API_URL}?action=medications&userId=${user.id}`));
       const data = await response.json();
       if (data.success) {
         setMedications(data.medications);
@@ -76,6 +77,7 @@ const Medications = ({ user }: MedicationsProps) => {
         toast.success('Лекарство добавлено');
         setShowDialog(false);
         setFormData({ name: '', dosage: '', frequency: '', timeSchedule: '', notes: '' });
+        rememberWriteToken(data.writeToken);
         loadMedications();
       }
     } catch (error) {
@@ -85,7 +87,7 @@ const Medications = ({ user }: MedicationsProps) => {
 
   const handleTaken = async (medId: number) => {
     try {
-      await fetch(API_URL, {
+      const response = await fetch(API_URL, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -95,6 +97,8 @@ const Medications = ({ user }: MedicationsProps) => {
           skipped: false
         })
       });
+      const data = await response.json();
+      rememberWriteToken(data.writeToken);
       toast.success('Приём отмечен ✓');
     } catch (error) {
       toast.error('Ошибка');